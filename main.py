@@ -1,9 +1,28 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import (
+    Flask,
+    render_template,
+    request,
+    redirect,
+    url_for,
+    flash,
+    jsonify,
+    get_flashed_messages,
+)
+import orjson
+import bisect
 import datetime
+import functools
+import heapq
+import itertools
 import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
-from dataclasses import dataclass
-from typing import List, Dict, Optional, Set
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Set, Tuple
 from agents import CancellationEmailAgent, EmailAgent
 
 
@@ -15,7 +34,14 @@ class Priority(Enum):
     URGENT = 4
 
 
-@dataclass
+class AppointmentStatus(Enum):
+    SCHEDULED = 1
+    COMPLETED = 2
+    CANCELLED = 3
+    RESCHEDULED = 4
+
+
+@dataclass(slots=True)
 class Patient:
     id: int
     name: str
@@ -33,12 +59,14 @@ class Patient:
             self.family_members = []
 
 
-@dataclass
+@dataclass(slots=True)
 class Clinician:
     id: int
     name: str
     specialization: str
     available_hours: Dict[str, List[datetime.time]] = None
+    # Bitmask of available minutes for each date.weekday(), 0 when off
+    _avail_masks: Tuple[int, ...] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.available_hours is None:
@@ -51,8 +79,17 @@ class Clinician:
                 "Friday": [datetime.time(9, 0), datetime.time(17, 0)],
             }
 
+        # Keys that aren't day names and empty or inverted ranges are never
+        # bookable, so they leave that day's mask empty
+        avail_masks = [0] * 7
+        for day, (start, end) in self.available_hours.items():
+            start_minute, end_minute = _minutes(start), _minutes(end)
+            if day in _WEEKDAYS and start_minute < end_minute:
+                avail_masks[_WEEKDAYS.index(day)] = _slot_mask(start_minute, end_minute)
+        self._avail_masks = tuple(avail_masks)
 
-@dataclass
+
+@dataclass(slots=True)
 class Appointment:
     id: int
     patient_id: int
@@ -60,10 +97,19 @@ class Appointment:
     date: datetime.date
     start_time: datetime.time
     end_time: datetime.time
-    status: str = "Scheduled"  # Scheduled, Completed, Cancelled, Rescheduled
+    status: AppointmentStatus = AppointmentStatus.SCHEDULED
+    # Index keys derived from date, start_time and end_time
+    date_ordinal: int = field(init=False, repr=False, compare=False)
+    start_minute: int = field(init=False, repr=False, compare=False)
+    end_minute: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.date_ordinal = self.date.toordinal()
+        self.start_minute = _minutes(self.start_time)
+        self.end_minute = _minutes(self.end_time)
 
 
-@dataclass
+@dataclass(slots=True)
 class WaitlistEntry:
     patient_id: int
     requested_date: datetime.date
@@ -78,15 +124,102 @@ class WaitlistEntry:
             self.date_added = datetime.date.today()
 
 
+# Day names indexed by date.weekday(), matching Clinician.available_hours keys
+_WEEKDAYS = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+
+
+def _parse_ymd(value: str) -> datetime.date:
+    """Parse a YYYY-MM-DD form value; month and day may be one digit."""
+    parts = value.split("-")
+    if (
+        len(parts) != 3
+        or not all(part.isdecimal() for part in parts)
+        or len(parts[0]) != 4
+        or not (0 < len(parts[1]) <= 2 and 0 < len(parts[2]) <= 2)
+    ):
+        raise ValueError(f"date {value!r} does not match format 'YYYY-MM-DD'")
+    year, month, day = map(int, parts)
+    return datetime.date(year, month, day)
+
+
+def _parse_hhmm(value: str) -> datetime.time:
+    """Parse an HH:MM form value; seconds and UTC offsets are rejected."""
+    hour, _, minute = value.partition(":")
+    if not (0 < len(hour) <= 2 and hour.isdecimal()) or not (
+        0 < len(minute) <= 2 and minute.isdecimal()
+    ):
+        raise ValueError(f"time {value!r} does not match format 'HH:MM'")
+    return datetime.time(int(hour), int(minute))
+
+
+def _minutes(t: datetime.time) -> int:
+    """Minutes since midnight."""
+    return t.hour * 60 + t.minute
+
+
+def _slot_mask(start_minute: int, end_minute: int) -> int:
+    """Bitmask with one bit set per minute of the day in [start, end)."""
+    return ((1 << (end_minute - start_minute)) - 1) << start_minute
+
+
+def _locked(method):
+    """Run an AppointmentSystem method while holding the system lock."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class AppointmentSystem:
     def __init__(self):
+        # Serializes mutations and reads that iterate shared state; the
+        # app serves requests from several threads
+        self.lock = threading.RLock()
         self.patients: Dict[int, Patient] = {}
         self.clinicians: Dict[int, Clinician] = {}
         self.appointments: Dict[int, Appointment] = {}
-        self.waitlist: List[WaitlistEntry] = []
-        self.holidays: Set[datetime.date] = set()
-        self.next_id = 1
+        # Waitlist entries by entry id, in insertion order
+        self.waitlist: Dict[int, WaitlistEntry] = {}
+        self._waitlist_counter = itertools.count()
+        # Heaps of (-priority, date added ordinal, entry id) for the entries
+        # that want a given date, a given clinician, or any clinician. Ids of
+        # entries that have left the waitlist are skipped lazily.
+        self._waitlist_by_date: Dict[datetime.date, List[Tuple[int, int, int]]] = (
+            defaultdict(list)
+        )
+        self._waitlist_by_clinician: Dict[int, List[Tuple[int, int, int]]] = (
+            defaultdict(list)
+        )
+        self._waitlist_any_clinician: List[Tuple[int, int, int]] = []
+        # Holiday dates as ordinals, see add_holiday()
+        self._holiday_ordinals: Set[int] = set()
+        # Shared id sequence for patients, clinicians and appointments
+        self._ids = itertools.count(1)
+        # Bumped whenever data shown on the dashboard changes
+        self.version = 0
+
+        # Live (non-cancelled) appointments per (clinician, date ordinal), kept
+        # sorted by start time
+        self._by_clinician_date: Dict[Tuple[int, int], List[Appointment]] = defaultdict(
+            list
+        )
+        # Minutes booked per (clinician, date ordinal), one bit per minute
+        self._day_mask: Dict[Tuple[int, int], int] = {}
+        # Live appointments per patient, kept sorted by date and start time
+        self._by_patient: Dict[int, List[Appointment]] = defaultdict(list)
 
+    @_locked
     def add_patient(
         self,
         name,
@@ -97,8 +230,7 @@ class AppointmentSystem:
         preferred_clinicians=None,
         family_members=None,
     ) -> int:
-        patient_id = self.next_id
-        self.next_id += 1
+        patient_id = next(self._ids)
 
         self.patients[patient_id] = Patient(
             id=patient_id,
@@ -110,11 +242,12 @@ class AppointmentSystem:
             preferred_clinicians=preferred_clinicians or [],
             family_members=family_members or [],
         )
+        self.version += 1
         return patient_id
 
+    @_locked
     def add_clinician(self, name, specialization, available_hours=None) -> int:
-        clinician_id = self.next_id
-        self.next_id += 1
+        clinician_id = next(self._ids)
 
         self.clinicians[clinician_id] = Clinician(
             id=clinician_id,
@@ -122,13 +255,21 @@ class AppointmentSystem:
             specialization=specialization,
             available_hours=available_hours,
         )
+        self.version += 1
         return clinician_id
 
+    @_locked
+    def add_holiday(self, date):
+        """Block a date for all clinicians."""
+        self._holiday_ordinals.add(date.toordinal())
+
+    @_locked
     def schedule_appointment(
         self, patient_id, clinician_id, date, start_time, end_time
     ) -> Optional[int]:
         # Check if date is a holiday
-        if date in self.holidays:
+        weekday, ordinal = date.weekday(), date.toordinal()
+        if ordinal in self._holiday_ordinals:
             return None
 
         # Check if clinician exists
@@ -139,36 +280,32 @@ class AppointmentSystem:
         if patient_id not in self.patients:
             return None
 
-        # Check clinician availability
-        day_of_week = date.strftime("%A")
-        clinician = self.clinicians[clinician_id]
-
-        if day_of_week not in clinician.available_hours:
+        # Reject empty or inverted time ranges
+        start_minute = _minutes(start_time)
+        end_minute = _minutes(end_time)
+        if start_minute >= end_minute:
             return None
 
-        avail_start, avail_end = clinician.available_hours[day_of_week]
-        if start_time < avail_start or end_time > avail_end:
+        # Check clinician availability and conflicts with existing appointments
+        # on the same day: every requested minute must be within the
+        # clinician's hours and not already booked
+        avail_mask = self.clinicians[clinician_id]._avail_masks[weekday]
+        booked_mask = self._day_mask.get((clinician_id, ordinal), 0)
+        if _slot_mask(start_minute, end_minute) & (~avail_mask | booked_mask):
             return None
 
-        # Check for conflicts with existing appointments
-        for appt in self.appointments.values():
-            if (
-                appt.clinician_id == clinician_id
-                and appt.date == date
-                and appt.status != "Cancelled"
-                and (
-                    (start_time >= appt.start_time and start_time < appt.end_time)
-                    or (end_time > appt.start_time and end_time <= appt.end_time)
-                    or (start_time <= appt.start_time and end_time >= appt.end_time)
-                )
-            ):
-                return None
+        return self._create_appointment(
+            patient_id, clinician_id, date, start_time, end_time
+        )
 
+    def _create_appointment(
+        self, patient_id, clinician_id, date, start_time, end_time
+    ) -> int:
+        """Book an already validated slot and update the indexes."""
         # Create the appointment
-        appointment_id = self.next_id
-        self.next_id += 1
+        appointment_id = next(self._ids)
 
-        self.appointments[appointment_id] = Appointment(
+        appointment = Appointment(
             id=appointment_id,
             patient_id=patient_id,
             clinician_id=clinician_id,
@@ -176,21 +313,43 @@ class AppointmentSystem:
             start_time=start_time,
             end_time=end_time,
         )
+        self.appointments[appointment_id] = appointment
+
+        key = (clinician_id, appointment.date_ordinal)
+        bisect.insort(
+            self._by_clinician_date[key], appointment, key=lambda x: x.start_minute
+        )
+        self._day_mask[key] = self._day_mask.get(key, 0) | _slot_mask(
+            appointment.start_minute, appointment.end_minute
+        )
+        bisect.insort(
+            self._by_patient[patient_id],
+            appointment,
+            key=lambda x: (x.date_ordinal, x.start_minute),
+        )
 
         # Send notification (simulated)
         self._send_appointment_confirmation(appointment_id)
 
+        self.version += 1
         return appointment_id
 
+    @_locked
     def cancel_appointment(self, appointment_id) -> bool:
         if appointment_id not in self.appointments:
             return False
 
         appointment = self.appointments[appointment_id]
-        if appointment.status == "Cancelled":
+        if appointment.status is AppointmentStatus.CANCELLED:
             return False
 
-        appointment.status = "Cancelled"
+        appointment.status = AppointmentStatus.CANCELLED
+        key = (appointment.clinician_id, appointment.date_ordinal)
+        self._by_clinician_date[key].remove(appointment)
+        self._day_mask[key] &= ~_slot_mask(
+            appointment.start_minute, appointment.end_minute
+        )
+        self._by_patient[appointment.patient_id].remove(appointment)
 
         # Send cancellation notification (simulated)
         self._send_cancellation_notification(appointment_id)
@@ -198,8 +357,10 @@ class AppointmentSystem:
         # Try to fill the slot from waitlist
         self._fill_cancelled_slot(appointment)
 
+        self.version += 1
         return True
 
+    @_locked
     def add_to_waitlist(
         self, patient_id, requested_date, priority, preferred_clinician_ids=None
     ) -> bool:
@@ -213,13 +374,30 @@ class AppointmentSystem:
             preferred_clinician_ids=preferred_clinician_ids or [],
         )
 
-        self.waitlist.append(entry)
+        entry_id = next(self._waitlist_counter)
+        self.waitlist[entry_id] = entry
 
-        # Sort waitlist by priority and then by date added
-        self.waitlist.sort(key=lambda x: (-x.priority.value, x.date_added))
+        # Order by priority, then by date added, then by insertion order
+        key = (-entry.priority.value, entry.date_added.toordinal(), entry_id)
+        heapq.heappush(self._waitlist_by_date[entry.requested_date], key)
+        if entry.preferred_clinician_ids:
+            for clinician_id in set(entry.preferred_clinician_ids):
+                heapq.heappush(self._waitlist_by_clinician[clinician_id], key)
+        else:
+            heapq.heappush(self._waitlist_any_clinician, key)
 
+        self.version += 1
         return True
 
+    @_locked
+    def get_waitlist(self) -> List[WaitlistEntry]:
+        """Get all waitlist entries in priority order."""
+        ordered = sorted(
+            self.waitlist.items(),
+            key=lambda x: (-x[1].priority.value, x[1].date_added, x[0]),
+        )
+        return [entry for _, entry in ordered]
+
     def _fill_cancelled_slot(self, cancelled_appointment) -> Optional[int]:
         """Attempt to fill a cancelled slot with a patient from the waitlist."""
         date = cancelled_appointment.date
@@ -227,28 +405,37 @@ class AppointmentSystem:
         start_time = cancelled_appointment.start_time
         end_time = cancelled_appointment.end_time
 
-        # Find suitable patients from waitlist
-        for i, entry in enumerate(self.waitlist):
-            # Check if the patient wants this date or a clinician
-            if entry.requested_date == date or (
-                not entry.preferred_clinician_ids
-                or clinician_id in entry.preferred_clinician_ids
-            ):
+        # The slot was valid when booked and has just been freed, so it only
+        # needs re-checking against holidays declared since then
+        if cancelled_appointment.date_ordinal in self._holiday_ordinals:
+            return None
 
-                # Try to schedule
-                new_appt_id = self.schedule_appointment(
-                    entry.patient_id, clinician_id, date, start_time, end_time
-                )
+        # Find the highest priority patient who wants this date, this
+        # clinician, or has no clinician preference
+        best = None
+        for heap in (
+            self._waitlist_by_date.get(date),
+            self._waitlist_by_clinician.get(clinician_id),
+            self._waitlist_any_clinician,
+        ):
+            # Drop entries that have already left the waitlist
+            while heap and heap[0][-1] not in self.waitlist:
+                heapq.heappop(heap)
+            if heap and (best is None or heap[0] < best):
+                best = heap[0]
 
-                if new_appt_id:
-                    # Remove from waitlist
-                    self.waitlist.pop(i)
+        if best is None:
+            return None
 
-                    # Send notification about the new appointment
-                    self._send_waitlist_notification(new_appt_id)
-                    return new_appt_id
+        # Remove from waitlist
+        entry = self.waitlist.pop(best[-1])
+        new_appt_id = self._create_appointment(
+            entry.patient_id, clinician_id, date, start_time, end_time
+        )
 
-        return None
+        # Send notification about the new appointment
+        self._send_waitlist_notification(new_appt_id)
+        return new_appt_id
 
     def _send_appointment_confirmation(self, appointment_id):
         """Simulate sending an appointment confirmation."""
@@ -262,42 +449,64 @@ class AppointmentSystem:
         """Simulate sending a notification about an appointment from waitlist."""
         pass
 
+    @_locked
     def get_clinician_schedule(self, clinician_id, date):
         """Get all appointments for a clinician on a specific date."""
         if clinician_id not in self.clinicians:
             return []
 
-        schedule = []
-        for appt in self.appointments.values():
-            if (
-                appt.clinician_id == clinician_id
-                and appt.date == date
-                and appt.status != "Cancelled"
-            ):
-                schedule.append(appt)
-
-        # Sort by start time
-        schedule.sort(key=lambda x: x.start_time)
-        return schedule
+        # The index is already sorted by start time
+        key = (clinician_id, date.toordinal())
+        return list(self._by_clinician_date.get(key, ()))
 
+    @_locked
     def get_patient_appointments(self, patient_id):
         """Get all appointments for a patient."""
         if patient_id not in self.patients:
             return []
 
-        patient_appts = []
-        for appt in self.appointments.values():
-            if appt.patient_id == patient_id and appt.status != "Cancelled":
-                patient_appts.append(appt)
-
-        # Sort by date and start time
-        patient_appts.sort(key=lambda x: (x.date, x.start_time))
-        return patient_appts
+        # The index is already sorted by date and start time
+        return list(self._by_patient.get(patient_id, ()))
 
 
 # Flask app setup
 app = Flask(__name__)
-app.secret_key = os.urandom(24)
+# A stable key keeps sessions valid across restarts and debug reloads
+app.secret_key = os.environ.get("SECRET_KEY") or os.urandom(24)
+
+
+def orjsonify(obj):
+    """Like jsonify, but serialized with orjson (dates are encoded natively)."""
+    return app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
+# Slow LLM agent calls run here instead of on the request thread; the
+# dashboard polls /job_status/<job_id> for the result
+_job_executor = ThreadPoolExecutor(max_workers=4)
+# (submitted at, future) by job id, oldest first
+_jobs: Dict[str, Tuple[float, Future]] = {}
+_jobs_lock = threading.Lock()
+# Finished jobs nobody polled are dropped after this many seconds, or
+# oldest first once the registry holds more than _MAX_JOBS entries
+_JOB_TTL = 600
+_MAX_JOBS = 256
+
+
+def _evict_jobs(now: float):
+    for job_id, (submitted, future) in list(_jobs.items()):
+        if future.done() and (now - submitted > _JOB_TTL or len(_jobs) > _MAX_JOBS):
+            del _jobs[job_id]
+
+
+def submit_job(fn, **kwargs) -> str:
+    """Run fn(**kwargs) in the background and return its job id."""
+    job_id = uuid.uuid4().hex
+    now = time.monotonic()
+    with _jobs_lock:
+        _evict_jobs(now)
+        _jobs[job_id] = (now, _job_executor.submit(fn, **kwargs))
+    return job_id
+
 
 # Initialize the appointment system
 system = AppointmentSystem()
@@ -332,6 +541,7 @@ sample_emails = [
         "read": False,
     },
 ]
+_emails_by_id = {email["id"]: email for email in sample_emails}
 
 
 # Add some sample data
@@ -370,8 +580,8 @@ def initialize_sample_data():
     )
 
     # Add some holidays
-    system.holidays.add(datetime.date(2023, 12, 25))  # Christmas
-    system.holidays.add(datetime.date(2024, 1, 1))  # New Year's Day
+    system.add_holiday(datetime.date(2023, 12, 25))  # Christmas
+    system.add_holiday(datetime.date(2024, 1, 1))  # New Year's Day
 
     # Schedule a few appointments
     next_monday = datetime.date.today() + datetime.timedelta(
@@ -390,21 +600,45 @@ def initialize_sample_data():
 initialize_sample_data()
 
 
+# Rendered dashboard, reused until the data it shows changes
+_index_cache: Dict[Tuple[int, int, int], str] = {}
+
+
+def _render_index():
+    with system.lock:
+        return render_template(
+            "index.html",
+            patients=system.patients,
+            clinicians=system.clinicians,
+            appointments=system.appointments,
+            waitlist=system.get_waitlist(),
+            emails=sample_emails,
+        )
+
+
 @app.route("/")
 def index():
-    return render_template(
-        "index.html",
-        patients=system.patients,
-        clinicians=system.clinicians,
-        appointments=system.appointments,
-        waitlist=system.waitlist,
-        emails=sample_emails,
+    # Pages showing flashed messages are one-off and never cached
+    if get_flashed_messages(with_categories=True):
+        return _render_index()
+
+    key = (
+        system.version,
+        len(sample_emails),
+        sum(1 for email in sample_emails if not email["read"]),
     )
+    html = _index_cache.get(key)
+    if html is None:
+        html = _render_index()
+        _index_cache.clear()
+        _index_cache[key] = html
+    return html
 
 
 @app.route("/patients")
 def patients():
-    return render_template("patients.html", patients=system.patients)
+    with system.lock:
+        return render_template("patients.html", patients=system.patients)
 
 
 @app.route("/add_patient", methods=["POST"])
@@ -414,9 +648,7 @@ def add_patient():
         email = request.form["email"]
         phone = request.form["phone"]
         address = request.form["address"]
-        birthday = datetime.datetime.strptime(
-            request.form["birthday"], "%Y-%m-%d"
-        ).date()
+        birthday = _parse_ymd(request.form["birthday"])
 
         preferred_clinicians = (
             request.form.get("preferred_clinicians", "").split(",")
@@ -448,7 +680,8 @@ def add_patient():
 
 @app.route("/clinicians")
 def clinicians():
-    return render_template("clinicians.html", clinicians=system.clinicians)
+    with system.lock:
+        return render_template("clinicians.html", clinicians=system.clinicians)
 
 
 @app.route("/add_clinician", methods=["POST"])
@@ -476,9 +709,9 @@ def schedule_appointment():
         start_time_str = request.form["start_time"]
         end_time_str = request.form["end_time"]
 
-        date = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
-        start_time = datetime.datetime.strptime(start_time_str, "%H:%M").time()
-        end_time = datetime.datetime.strptime(end_time_str, "%H:%M").time()
+        date = _parse_ymd(date_str)
+        start_time = _parse_hhmm(start_time_str)
+        end_time = _parse_hhmm(end_time_str)
 
         appointment_id = system.schedule_appointment(
             patient_id, clinician_id, date, start_time, end_time
@@ -503,9 +736,10 @@ def cancel_appointment(appointment_id):
             patient = system.patients[appointment.patient_id]
             clinician = system.clinicians[appointment.clinician_id]
 
-            # Generate cancellation email
+            # Generate cancellation email in the background
             email_agent = CancellationEmailAgent()
-            cancellation_email = email_agent.generate_email(
+            job_id = submit_job(
+                email_agent.generate_email,
                 patient_name=patient.name,
                 appointment_date=appointment.date.strftime("%Y-%m-%d"),
                 appointment_time=f"{appointment.start_time.strftime('%H:%M')} - {appointment.end_time.strftime('%H:%M')}",
@@ -518,7 +752,7 @@ def cancel_appointment(appointment_id):
                 "patient_name": patient.name,
                 "patient_id": patient.id,
                 "email": patient.email,
-                "cancellation_email": cancellation_email,
+                "job_id": job_id,
             }
 
             # Return JSON response with email content and details
@@ -586,7 +820,7 @@ def add_to_waitlist():
         date_str = request.form["requested_date"]
         priority_value = int(request.form["priority"])
 
-        requested_date = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
+        requested_date = _parse_ymd(date_str)
         priority = Priority(priority_value)
 
         preferred_clinician_ids = []
@@ -611,7 +845,7 @@ def add_to_waitlist():
 def get_clinician_schedule():
     clinician_id = int(request.args.get("clinician_id"))
     date_str = request.args.get("date")
-    date = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
+    date = _parse_ymd(date_str)
 
     schedule = system.get_clinician_schedule(clinician_id, date)
 
@@ -623,13 +857,13 @@ def get_clinician_schedule():
             {
                 "id": appt.id,
                 "patient_name": patient.name,
-                "start_time": appt.start_time.strftime("%H:%M"),
-                "end_time": appt.end_time.strftime("%H:%M"),
-                "status": appt.status,
+                "start_time": appt.start_time.isoformat("minutes"),
+                "end_time": appt.end_time.isoformat("minutes"),
+                "status": appt.status.name.title(),
             }
         )
 
-    return jsonify(schedule_data)
+    return orjsonify(schedule_data)
 
 
 @app.route("/get_patient_appointments", methods=["GET"])
@@ -646,21 +880,21 @@ def get_patient_appointments():
             {
                 "id": appt.id,
                 "clinician_name": clinician.name,
-                "date": appt.date.strftime("%Y-%m-%d"),
-                "start_time": appt.start_time.strftime("%H:%M"),
-                "end_time": appt.end_time.strftime("%H:%M"),
-                "status": appt.status,
+                "date": appt.date,
+                "start_time": appt.start_time.isoformat("minutes"),
+                "end_time": appt.end_time.isoformat("minutes"),
+                "status": appt.status.name.title(),
             }
         )
 
-    return jsonify(appointment_data)
+    return orjsonify(appointment_data)
 
 
 @app.route("/get_email_response/<int:email_id>", methods=["GET"])
 def get_email_response(email_id):
     try:
         # Find the email by ID
-        email = next((e for e in sample_emails if e["id"] == email_id), None)
+        email = _emails_by_id.get(email_id)
 
         if not email:
             return jsonify({"error": "Email not found"}), 404
@@ -668,9 +902,10 @@ def get_email_response(email_id):
         # Mark email as read
         email["read"] = True
 
-        # Generate response using EmailAgent
+        # Generate response using EmailAgent in the background
         email_agent = EmailAgent()
-        response = email_agent.generate_response(
+        job_id = submit_job(
+            email_agent.generate_response,
             sender_name=email["sender"],
             email_subject=email["subject"],
             email_content=email["content"],
@@ -683,7 +918,7 @@ def get_email_response(email_id):
                 "email": email["email"],
                 "subject": email["subject"],
                 "content": email["content"],
-                "response": response,
+                "job_id": job_id,
             }
         )
 
@@ -691,6 +926,25 @@ def get_email_response(email_id):
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/job_status/<job_id>", methods=["GET"])
+def job_status(job_id):
+    entry = _jobs.get(job_id)
+    if entry is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    future = entry[1]
+    if not future.done():
+        return jsonify({"status": "pending"})
+
+    # Finished jobs are handed out once
+    with _jobs_lock:
+        _jobs.pop(job_id, None)
+    try:
+        return jsonify({"status": "finished", "result": future.result()})
+    except Exception as e:
+        return jsonify({"status": "failed", "error": str(e)}), 500
+
+
 @app.route("/send_email_response", methods=["POST"])
 def send_email_response():
     try:
@@ -698,7 +952,7 @@ def send_email_response():
         response_content = request.form.get("response_content")
 
         # Find the email by ID
-        email = next((e for e in sample_emails if e["id"] == email_id), None)
+        email = _emails_by_id.get(email_id)
 
         if not email:
             flash("Email not found.", "danger")
@@ -709,6 +963,7 @@ def send_email_response():
         flash(f"Response sent to {email['sender']} ({email['email']})!", "success")
 
         # Remove the email from the inbox
+        del _emails_by_id[email_id]
         sample_emails.remove(email)
 
         return redirect(url_for("index"))